@@ -1,10 +1,18 @@
 from OthelloEvaluator import OthelloEvaluator
 from OthelloAlgorithm import OthelloAlgorithm
 from OthelloAction import OthelloAction
-from OthelloPosition import OthelloPosition
+from OthelloPosition import OthelloPosition, PASS_MOVE
+from Bitboard import flips, generate_moves, popcount, FULL
+import threading
 import time
 import sys
-from Node import Node
+
+
+# Transposition table entry flags: the stored value is exact, a lower bound or an upper bound
+EXACT, LOWER, UPPER = 0, 1, 2
+
+# Window bounds, created once instead of calling float("inf") at every node
+INF = float("inf")
 
 
 class StopSignal(Exception):
@@ -29,13 +37,43 @@ class AlphaBeta(OthelloAlgorithm):
 
     DefaultDepth = 5
 
-    def __init__(self, othello_evaluator: OthelloEvaluator, depth=DefaultDepth):
-        self.evaluator = othello_evaluator
-        self.search_depth = depth
-        self.evaluator = othello_evaluator
+    # Quiescence extension: a leaf reached by flipping more than QuiescenceTrigger discs is
+    # searched up to QuiescenceDepth extra plies, following only moves that flip at least
+    # QuiescenceMinFlips discs
+    QuiescenceDepth = 2
+    QuiescenceTrigger = 4
+    QuiescenceMinFlips = 3
+
+    # Half width of the aspiration window around the previous iteration's score
+    AspirationWindow = 50
+
+    # Longest possible line from the root (a game has at most 60 moves, plus passes)
+    MaxPly = 128
+
+    # Value of one disc of the final margin in a finished game. Larger than any heuristic score,
+    # so a won game is preferred to every unfinished line and a lost one avoided
+    GameOverDiscValue = 100000
+
+    def __init__(
+        self,
+        othello_evaluator: OthelloEvaluator,
+        depth=DefaultDepth,
+        quiescence_depth=QuiescenceDepth,
+        transposition_table=None,
+    ):
+        self.set_evaluator(othello_evaluator)
         self.search_depth = depth
-        self.time_limit = None
-        self.start_time = None
+        self.quiescence_depth = quiescence_depth
+        # Zobrist hash -> (depth, flag, value, best square). Kept across evaluate() calls so each
+        # iterative deepening pass can reuse the results of the shallower ones.
+        self.transposition_table = {} if transposition_table is None else transposition_table
+        # Move ordering state learnt from beta cutoffs: two killer moves per ply and a
+        # history score per square. Kept across evaluate() calls like the table above.
+        self.killers = [[None, None] for _ in range(self.MaxPly)]
+        self.history = [0] * 64
+        # Set by a timer thread when the time limit runs out, so the search only reads a flag
+        self.time_is_up = False
+        self.timer = None
         self.nodes_searched = 0
 
         # to be safe, we increase the recursion limit for deep searches
@@ -49,6 +87,11 @@ class AlphaBeta(OthelloAlgorithm):
             othello_evaluator (OthelloEvaluator): The evaluator to use
         """
         self.evaluator = othello_evaluator
+        # The evaluator's move priority of every square, looked up once here instead of called
+        # per move when sorting. The last entry is for a pass, so PASS_MOVE (-1) indexes it.
+        self.square_priority = tuple(
+            othello_evaluator.move_priority(OthelloAction(square // 8 + 1, square % 8 + 1)) for square in range(64)
+        ) + (othello_evaluator.move_priority(OthelloAction(0, 0, True)),)
 
     def set_search_depth(self, depth):
         """
@@ -67,175 +110,406 @@ class AlphaBeta(OthelloAlgorithm):
             time_limit (float): Maximum time allowed for search in seconds
             start_time (float): Optional start time, if None uses current time
         """
-        self.start_time = start_time if start_time is not None else time.time()
-        self.time_limit = time_limit
-        self.nodes_searched = 0  # Reset node counter
+        if start_time is None:
+            start_time = time.time()
+
+        # Instead of reading the clock during the search, let a timer raise the flag the nodes check
+        if self.timer is not None:
+            self.timer.cancel()
+        self.time_is_up = False
+        self.timer = None
+        if time_limit:
+            self.timer = threading.Timer(max(time_limit - (time.time() - start_time), 0.0), self.__stop)
+            self.timer.daemon = True
+            self.timer.start()
+
+    def __stop(self):
+        """
+        Timer callback: mark the time limit as exceeded.
+        """
+        self.time_is_up = True
 
-    def __force_stop_if_time_elapsed(self):
+    def clear_search_state(self):
         """
-        Check if time limit has been exceeded and raise StopSignal if so.
+        Reset the state of a single search (the node counter) before the next iteration.
 
-        This method is called during search to ensure the algorithm
-        respects the time limit and can gracefully terminate.
+        The transposition table is kept on purpose: it is what lets an iterative
+        deepening pass reuse the work of the shallower ones.
+        """
+        self.nodes_searched = 0
 
-        Raises:
-            StopSignal: When time limit is exceeded
+    def __is_noisy(self, pos: OthelloPosition, q_depth: int) -> bool:
         """
+        Check if a leaf should be extended by quiescence search.
 
-        if self.start_time and self.time_limit and (time.time() - self.start_time) >= self.time_limit:
-            raise StopSignal()
+        A position reached by a move that flipped many discs is likely to swing back on the
+        next ply, so its static evaluation is unreliable (horizon effect).
+
+        Args:
+            pos (OthelloPosition): The leaf position
+            q_depth (int): Quiescence plies already searched beyond the nominal depth
 
-    def evaluate(self, othello_position: OthelloPosition) -> OthelloAction:
+        Returns:
+            True if the leaf should be searched further
         """
-        Evaluate the given position and return the best move.
+        # Most leaves are reached by quiet moves, so test the flip count first
+        return pos.flipped_count > self.QuiescenceTrigger and q_depth < self.quiescence_depth
 
-        This method initiates the alpha-beta search from the given position.
-        It starts the minimax search with alpha=-inf and beta=+inf.
+    @staticmethod
+    def __put_first(moves: list, square):
+        """
+        Move a square to the front of a move list (in place), if it is in the list.
 
         Args:
-            othello_position (OthelloPosition): The position to evaluate
+            moves (list): Move list as square indices
+            square (int): The move to search first, or None
+        """
+        # Usually the move is already first (or absent), so check that before scanning the list
+        if square is not None and moves and moves[0] != square and square in moves:
+            moves.remove(square)
+            moves.insert(0, square)
+
+    def __order_moves(self, moves: list, depth: int):
+        """
+        Sort a move list (in place) so the moves most likely to cause a cutoff come first.
+
+        Moves are sorted by static square priority; within the same priority class killer
+        moves of this ply go first, then the rest by the history score of the square.
+
+        Args:
+            moves (list): Move list as square indices
+            depth (int): Remaining depth of the node
+        """
+        if len(moves) < 2:
+            return
+        killers = self.killers[self.search_depth - depth] if depth > 0 else (None, None)
+        priority = self.square_priority
+        history = self.history
+        moves.sort(key=lambda square: (priority[square], square in killers, history[square]), reverse=True)
+
+    def __record_cutoff(self, square: int, depth: int):
+        """
+        Remember a move that caused a beta cutoff, as a killer of its ply and in the history table.
+
+        Args:
+            square (int): The move that caused the cutoff
+            depth (int): Remaining depth of the node
+        """
+        if depth == 0 or square == PASS_MOVE:
+            return
+        killers = self.killers[self.search_depth - depth]
+        if killers[0] != square:
+            killers[1] = killers[0]
+            killers[0] = square
+        self.history[square] += depth * depth
+
+    def __final_score(self, pos: OthelloPosition) -> int:
+        """
+        Score a finished game exactly, by its final disc margin.
+
+        Args:
+            pos (OthelloPosition): A position where neither player can move
 
         Returns:
-            OthelloAction: The best move found by the algorithm
+            int: The disc margin of the player to move times GameOverDiscValue
         """
+        margin = popcount(pos.white_bitboard) - popcount(pos.black_bitboard)
+        return self.GameOverDiscValue * (margin if pos.maxPlayer else -margin)
 
-        best_action = self.max_value(othello_position, float("-inf"), float("inf"), self.search_depth)
-        return best_action
+    def __score_children(self, pos: OthelloPosition, moves: list) -> list:
+        """
+        Score all moves of a position by the disc differential of the child they lead to.
+
+        A move adds one disc for the player to move and turns the flipped discs over, so
+        the child's differential follows from the flips alone, without building the child.
 
-    def max_value(self, pos: OthelloPosition, alpha: float, beta: float, depth: int):
+        Args:
+            pos (OthelloPosition): The parent position (its player to move is the scoring perspective)
+            moves (list): The legal moves of pos as square indices
+
+        Returns:
+            list: Disc differential of each child for the player to move in pos
         """
-        Maximize the score for the current player (MAX node).
+        if pos.maxPlayer:
+            own, opp = pos.white_bitboard, pos.black_bitboard
+        else:
+            own, opp = pos.black_bitboard, pos.white_bitboard
+        base = popcount(own) - popcount(opp) + 1
+        return [base + 2 * popcount(flips(own, opp, square)) for square in moves]
+
+    def __order_root_moves(self, pos: OthelloPosition) -> list:
+        """
+        Order the root moves using a cheap 1-ply look-ahead.
 
-        This method implements the MAX part of the minimax algorithm.
-        It tries to find the move that maximizes the score for the
-        current player while respecting alpha-beta pruning.
+        Moves are sorted by the static move priority first; within the same
+        priority class, moves that leave the most discs for the player to move are
+        searched first. Good ordering at the root pays off in every subtree.
 
         Args:
-            pos (OthelloPosition): Current game position
-            alpha (float): Alpha bound for pruning
-            beta (float): Beta bound for pruning
-            depth (int): Current search depth
+            pos (OthelloPosition): The root position
 
         Returns:
-            OthelloAction: Best move for the current player
+            list: The legal moves at the root as square indices, best first
+        """
+        moves = pos.get_move_squares()
+        if len(moves) < 2:
+            return moves
+
+        scores = self.__score_children(pos, moves)
+        priority = self.square_priority
+        order = sorted(range(len(moves)), key=lambda i: (priority[moves[i]], scores[i]), reverse=True)
+        return [moves[i] for i in order]
+
+    def evaluate(
+        self,
+        othello_position: OthelloPosition,
+        pv_hint: OthelloAction = None,
+        alpha: float = -INF,
+        beta: float = INF,
+    ) -> OthelloAction:
         """
+        Evaluate the given position and return the best move.
 
-        # Check time limit before proceeding
-        if self.nodes_searched % 1000 == 0:
-            self.__force_stop_if_time_elapsed()
+        This method initiates the alpha-beta search from the given position.
+        By default it starts the minimax search with alpha=-inf and beta=+inf.
+        The search itself works on square indices; the result is converted
+        to an OthelloAction only here, once per search.
 
-        self.nodes_searched += 1
+        Args:
+            othello_position (OthelloPosition): The position to evaluate
+            pv_hint (OthelloAction): Optional best move of the previous (shallower) search, tried first
+            alpha (float): Lower bound of the search window
+            beta (float): Upper bound of the search window
 
-        possible_moves = pos.get_moves()
+        Returns:
+            OthelloAction: The best move found by the algorithm. If its value is outside
+            (alpha, beta) it is only a bound and the move may not be the best one.
+        """
 
-        # Terminal condition: reached maximum depth
-        if depth == 0:
-            value = self.evaluator.evaluate(pos)
-            # Dummy action to carry evaluation value
-            leaf = OthelloAction(0, 0, False)
-            leaf.value = value
-            return leaf
+        root_moves = self.__order_root_moves(othello_position)
+        if pv_hint is not None and not pv_hint.is_pass_move:
+            self.__put_first(root_moves, (pv_hint.row - 1) * 8 + (pv_hint.col - 1))
+
+        # The search makes and takes back moves on one position, so work on a copy: a StopSignal
+        # can leave it in the middle of a line
+        root = othello_position.clone()
+        if self.search_depth > 0:
+            best_value, best_square = self.__search_root(root, alpha, beta, root_moves)
+        else:
+            # Nothing to search: play the first move of the static ordering
+            best_value = self.negamax(root, alpha, beta, 0, 1, moves=root_moves)
+            best_square = root_moves[0] if root_moves else PASS_MOVE
+
+        if best_square == PASS_MOVE:
+            best_action = OthelloAction(0, 0, True)
+        else:
+            best_action = OthelloAction(best_square // 8 + 1, best_square % 8 + 1)
+        best_action.value = best_value
+        return best_action
 
-        # Initialize best value and action
-        best_value = float("-inf")
-        best_action = None
+    def aspiration_search(
+        self, othello_position: OthelloPosition, prev_score: float = None, pv_hint: OthelloAction = None
+    ) -> OthelloAction:
+        """
+        Search with a narrow window around the score of the previous iteration.
 
-        # Handle case with no legal moves
-        if not possible_moves:
-            possible_moves = [OthelloAction(0, 0, True)]
+        The score rarely moves much from one depth to the next, and a narrow window
+        prunes far more than (-inf, +inf). If the result falls outside the window the
+        position is searched again with the window opened on that side.
 
-        # Sort moves by priority to improve alpha-beta pruning efficiency
-        # Higher priority moves are searched first
-        possible_moves.sort(key=self.evaluator.move_priority, reverse=True)
+        Args:
+            othello_position (OthelloPosition): The position to evaluate
+            prev_score (float): Score of the previous iteration, or None to search the full window
+            pv_hint (OthelloAction): Optional best move of the previous (shallower) search, tried first
 
-        for action in possible_moves:
-            # Time control check
-            self.__force_stop_if_time_elapsed()
+        Returns:
+            OthelloAction: The best move found by the algorithm
+        """
+        if prev_score is None:
+            return self.evaluate(othello_position, pv_hint)
+
+        alpha = prev_score - self.AspirationWindow
+        beta = prev_score + self.AspirationWindow
+        move = self.evaluate(othello_position, pv_hint, alpha, beta)
+        if move.value <= alpha:
+            # Fail low: the value is an upper bound
+            move = self.evaluate(othello_position, pv_hint, -INF, move.value + 1)
+        elif move.value >= beta:
+            # Fail high: the value is a lower bound
+            move = self.evaluate(othello_position, move, move.value - 1, INF)
+        return move
+
+    def __search_root(self, pos: OthelloPosition, alpha: float, beta: float, moves: list):
+        """
+        Search the root moves (MAX node), probing all but the first with a null window.
 
-            # Make move and evaluate resulting position
-            child_pos = pos.make_move(action)
-            min_action = self.min_value(child_pos, alpha, beta, depth - 1)
+        The first move is normally the best one of the previous iteration, so it is searched
+        with the full window. Every other move only has to be shown not to beat it, which a
+        (alpha, alpha + 1) search does with far fewer nodes; a move that does beat it is
+        searched again with the full window to get its value.
 
-            # Update best move if this is better
-            if min_action.value > best_value:
-                best_value = min_action.value
-                best_action = action
+        Args:
+            pos (OthelloPosition): The root position
+            alpha (float): Alpha bound for pruning
+            beta (float): Beta bound for pruning
+            moves (list): The ordered root moves as square indices
 
-            # Update alpha bound
-            alpha = max(alpha, best_value)
+        Returns:
+            tuple: (value, square) of the best move at the root
+        """
+        self.nodes_searched += 1
+        depth = self.search_depth
+
+        best_value = -INF
+        best_square = None
+        for square in moves or [PASS_MOVE]:
+            # Check time limit before every root move (a flag read, see set_time_limit)
+            if self.time_is_up:
+                raise StopSignal()
+
+            undo = pos.make_move_inplace(square)
+            if best_square is None:
+                value = -self.negamax(pos, -beta, -alpha, depth - 1, -1)
+            else:
+                value = -self.negamax(pos, -alpha - 1, -alpha, depth - 1, -1)
+                if alpha < value < beta:
+                    value = -self.negamax(pos, -beta, -alpha, depth - 1, -1)
+            pos.undo_move(undo)
+
+            if value > best_value:
+                best_value = value
+                best_square = square
 
-            # Alpha-beta pruning: stop if alpha >= beta
+            alpha = max(alpha, best_value)
             if alpha >= beta:
-                break  # Beta cutoff
+                break
 
-        best_action.value = best_value
-        return best_action
+        return best_value, best_square
 
-    def min_value(self, pos: OthelloPosition, alpha: float, beta: float, depth: int):
+    def negamax(
+        self, pos: OthelloPosition, alpha: float, beta: float, depth: int, color: int, q_depth: int = 0, moves=None
+    ) -> float:
         """
-        Minimize the score for the opponent (MIN node).
+        Search a position with alpha-beta pruning in negamax form.
 
-        This method implements the MIN part of the minimax algorithm.
-        It tries to find the move that minimizes the score for the
-        current player (maximizes opponent's advantage) while respecting
-        alpha-beta pruning.
+        Both players are searched by this one method: the value of a position is the
+        negated value of its best child, so the player to move always maximizes. The
+        evaluator scores positions from the starting player's side, so leaf scores are
+        multiplied by color to get them from the side of the player to move.
 
         Args:
             pos (OthelloPosition): Current game position
-            alpha (float): Alpha bound for pruning
-            beta (float): Beta bound for pruning
-            depth (int): Current search depth
+            alpha (float): Alpha bound for pruning, for the player to move
+            beta (float): Beta bound for pruning, for the player to move
+            depth (int): Remaining search depth
+            color (int): 1 if the starting player is to move (a MAX node), -1 otherwise
+            q_depth (int): Quiescence plies already searched beyond the nominal depth
+            moves (list): Optional pre-ordered moves to search instead of generating them (used at the root)
 
         Returns:
-            OthelloAction: Best move for the opponent
+            float: The value of the position for the player to move
         """
-        # Check time limit before proceeding
-        if self.nodes_searched % 1000 == 0:
-            self.__force_stop_if_time_elapsed()
+
+        # Check time limit before proceeding (a flag read, see set_time_limit)
+        if self.time_is_up:
+            raise StopSignal()
 
         self.nodes_searched += 1
 
-        # Get possible moves for opponent
-        possible_moves = pos.get_moves()
+        # Terminal condition: reached maximum depth on a quiet position
+        if depth == 0 and not self.__is_noisy(pos, q_depth):
+            # A full board is a finished game, which is scored exactly
+            if pos.white_bitboard | pos.black_bitboard == FULL:
+                return self.__final_score(pos)
+            return color * self.evaluator.evaluate(pos)
+
+        # Transposition table probe: reuse a result from an equally deep or deeper search.
+        # A position is always reached with the same player to move, so its stored value
+        # is from that player's side as well.
+        alpha_orig = alpha
+        hash_move = None
+        if depth > 0:
+            entry = self.transposition_table.get(pos.zobrist)
+            if entry is not None:
+                # Even a shallower entry knows the best move of an earlier iteration
+                hash_move = entry[3]
+                if entry[0] >= depth:
+                    flag, value = entry[1], entry[2]
+                    if flag == EXACT:
+                        return value
+                    if flag == LOWER:
+                        alpha = max(alpha, value)
+                    else:
+                        beta = min(beta, value)
+                    if alpha >= beta:
+                        return value
+
+        # Leaves never need the move list, so only generate it for interior nodes
+        possible_moves = pos.get_move_squares() if moves is None else moves
+
+        # Initialize best value and move
+        best_value = -INF
+        best_square = None
 
-        # Terminal condition: reached maximum depth
         if depth == 0:
-            value = self.evaluator.evaluate(pos)
-            # Dummy action to carry evaluation value
-            leaf = OthelloAction(0, 0, False)
-            leaf.value = value
-            return leaf
-
-        # Initialize best value and action for MIN player
-        best_value = float("inf")
-        best_action = None
+            # Quiescence node: stand pat on the static evaluation, since the player may
+            # also decline the high-flip continuations searched below
+            best_value = color * self.evaluator.evaluate(pos)
+            alpha = max(alpha, best_value)
+            if alpha >= beta:
+                return best_value
 
-        # Handle case with no legal moves
+        # Handle case with no legal moves: pass, unless the opponent cannot move either,
+        # in which case the game is over and its result is known exactly
         if not possible_moves:
-            possible_moves = [OthelloAction(0, 0, True)]
+            if pos.maxPlayer:
+                opponent_moves = generate_moves(pos.black_bitboard, pos.white_bitboard)
+            else:
+                opponent_moves = generate_moves(pos.white_bitboard, pos.black_bitboard)
+            if not opponent_moves:
+                return self.__final_score(pos)
+            possible_moves = [PASS_MOVE]
 
         # Sort moves by priority to improve alpha-beta pruning efficiency
-        possible_moves.sort(key=self.evaluator.move_priority, reverse=True)
-
-        for action in possible_moves:
-            # Time control check
-            self.__force_stop_if_time_elapsed()
-
-            # Make move and evaluate resulting position
-            child_pos = pos.make_move(action)
-            max_action = self.max_value(child_pos, alpha, beta, depth - 1)
+        # Higher priority moves are searched first
+        if moves is None:
+            self.__order_moves(possible_moves, depth)
+        # The principal variation move of the previous iteration goes first
+        self.__put_first(possible_moves, hash_move)
+
+        # No time check per child here: each child checks the time flag itself when it is entered
+        for square in possible_moves:
+            # Make the move on the position itself, search it and take it back
+            undo = pos.make_move_inplace(square)
+            if depth > 0:
+                value = -self.negamax(pos, -beta, -alpha, depth - 1, -color, q_depth)
+            elif pos.flipped_count >= self.QuiescenceMinFlips:
+                value = -self.negamax(pos, -beta, -alpha, 0, -color, q_depth + 1)
+            else:
+                pos.undo_move(undo)
+                continue
+            pos.undo_move(undo)
 
-            # Update best move if this minimizes opponent's score
-            if max_action.value < best_value:
-                best_value = max_action.value
-                best_action = action
+            # Update best move if this is better
+            if value > best_value:
+                best_value = value
+                best_square = square
 
-            # Update beta bound
-            beta = min(beta, best_value)
+            # Update alpha bound
+            alpha = max(alpha, best_value)
 
             # Alpha-beta pruning: stop if alpha >= beta
-            if beta <= alpha:
-                break  # Alpha cutoff
+            if alpha >= beta:
+                self.__record_cutoff(square, depth)
+                break  # Beta cutoff
 
-        best_action.value = best_value
-        return best_action
+        if depth > 0:
+            if best_value <= alpha_orig:
+                flag = UPPER
+            elif best_value >= beta:
+                flag = LOWER
+            else:
+                flag = EXACT
+            self.transposition_table[pos.zobrist] = (depth, flag, best_value, best_square)
+
+        return best_value
@@ -0,0 +1,213 @@
+"""
+Bitboard helpers for Othello.
+
+A bitboard is a Python int holding one bit per square: bit (row - 1) * 8 + (col - 1) is set when the
+square (row, col) is occupied by the discs the bitboard describes. Row 1 is in the lowest byte and
+column 1 is the lowest bit of each byte, so the bit index is the same square index the search uses.
+
+Shifting a bitboard moves every disc one step in a direction at once. Moving east or west (also
+diagonally) wraps around from one row into the next, so those shifts are masked with the files
+the discs can legally land on.
+"""
+
+import numpy as np
+
+FULL = 0xFFFFFFFFFFFFFFFF  # all 64 squares
+NOT_A_FILE = 0xFEFEFEFEFEFEFEFE  # every square except column 1
+NOT_H_FILE = 0x7F7F7F7F7F7F7F7F  # every square except column 8
+
+# BIT[square] is the bitboard with only that square set
+BIT = tuple(1 << square for square in range(64))
+
+# (shift, landing mask) per direction. Directions with a positive shift move towards higher bits.
+LEFT_SHIFTS = (
+    (1, NOT_A_FILE),  # E
+    (9, NOT_A_FILE),  # SE
+    (8, FULL),  # S
+    (7, NOT_H_FILE),  # SW
+)
+RIGHT_SHIFTS = (
+    (1, NOT_H_FILE),  # W
+    (9, NOT_H_FILE),  # NW
+    (8, FULL),  # N
+    (7, NOT_A_FILE),  # NE
+)
+
+
+def generate_moves(own: int, opp: int) -> int:
+    """
+    Compute all legal moves for the player owning `own`.
+
+    Uses a Kogge-Stone fill per direction: our discs are grown over the opponent's discs in
+    steps of 1, 2 and 4 squares, so a run of up to six opponent discs is covered in three
+    steps without branching. An empty square right after such a run is a legal move.
+
+    The eight directions are written out (see LEFT_SHIFTS and RIGHT_SHIFTS for the shift and
+    mask of each) since this runs at every node and for both sides in the evaluation.
+
+    Args:
+        own (int): Bitboard of the player to move
+        opp (int): Bitboard of the opponent
+
+    Returns:
+        int: Bitboard with one bit set per legal move
+    """
+    opp_a = opp & NOT_A_FILE
+    opp_h = opp & NOT_H_FILE
+
+    # E
+    pro = opp_a
+    gen = own | (pro & (own << 1))
+    pro &= pro << 1
+    gen |= pro & (gen << 2)
+    pro &= pro << 2
+    gen |= pro & (gen << 4)
+    moves = ((gen & opp) << 1) & NOT_A_FILE
+    # W
+    pro = opp_h
+    gen = own | (pro & (own >> 1))
+    pro &= pro >> 1
+    gen |= pro & (gen >> 2)
+    pro &= pro >> 2
+    gen |= pro & (gen >> 4)
+    moves |= ((gen & opp) >> 1) & NOT_H_FILE
+    # S
+    pro = opp
+    gen = own | (pro & (own << 8))
+    pro &= pro << 8
+    gen |= pro & (gen << 16)
+    pro &= pro << 16
+    gen |= pro & (gen << 32)
+    moves |= (gen & opp) << 8
+    # N
+    pro = opp
+    gen = own | (pro & (own >> 8))
+    pro &= pro >> 8
+    gen |= pro & (gen >> 16)
+    pro &= pro >> 16
+    gen |= pro & (gen >> 32)
+    moves |= (gen & opp) >> 8
+    # SE
+    pro = opp_a
+    gen = own | (pro & (own << 9))
+    pro &= pro << 9
+    gen |= pro & (gen << 18)
+    pro &= pro << 18
+    gen |= pro & (gen << 36)
+    moves |= ((gen & opp) << 9) & NOT_A_FILE
+    # NW
+    pro = opp_h
+    gen = own | (pro & (own >> 9))
+    pro &= pro >> 9
+    gen |= pro & (gen >> 18)
+    pro &= pro >> 18
+    gen |= pro & (gen >> 36)
+    moves |= ((gen & opp) >> 9) & NOT_H_FILE
+    # SW
+    pro = opp_h
+    gen = own | (pro & (own << 7))
+    pro &= pro << 7
+    gen |= pro & (gen << 14)
+    pro &= pro << 14
+    gen |= pro & (gen << 28)
+    moves |= ((gen & opp) << 7) & NOT_H_FILE
+    # NE
+    pro = opp_a
+    gen = own | (pro & (own >> 7))
+    pro &= pro >> 7
+    gen |= pro & (gen >> 14)
+    pro &= pro >> 14
+    gen |= pro & (gen >> 28)
+    moves |= ((gen & opp) >> 7) & NOT_A_FILE
+
+    return moves & ~(own | opp) & FULL
+
+
+def neighbours(bb: int) -> int:
+    """
+    Compute the squares next to (in any of the eight directions) a square of a bitboard.
+
+    The east/west neighbours are added to the discs first, so shifting that row smear one
+    row up and one row down covers the vertical and diagonal neighbours as well.
+
+    Args:
+        bb (int): The bitboard
+
+    Returns:
+        int: Bitboard of all squares adjacent to a set bit (may include set bits themselves)
+    """
+    sideways = ((bb << 1) & NOT_A_FILE) | ((bb >> 1) & NOT_H_FILE)
+    row = bb | sideways
+    return (sideways | (row << 8) | (row >> 8)) & FULL
+
+
+def flips(own: int, opp: int, square: int) -> int:
+    """
+    Compute the opponent discs flipped by placing a disc on `square`.
+
+    Args:
+        own (int): Bitboard of the player to move
+        opp (int): Bitboard of the opponent
+        square (int): Square index of the move
+
+    Returns:
+        int: Bitboard of the flipped discs (0 if the move flips nothing, i.e. is illegal)
+    """
+    move = BIT[square]
+    flipped = 0
+    for s, mask in LEFT_SHIFTS:
+        line = 0
+        x = (move << s) & mask
+        while x & opp:
+            line |= x
+            x = (x << s) & mask
+        if x & own:
+            flipped |= line
+    for s, mask in RIGHT_SHIFTS:
+        line = 0
+        x = (move >> s) & mask
+        while x & opp:
+            line |= x
+            x = (x >> s) & mask
+        if x & own:
+            flipped |= line
+    return flipped
+
+
+# Count the set bits (discs) of a bitboard. int.bit_count (Python 3.10+) is a single popcount
+# instruction; older interpreters fall back to counting the ones of the binary string.
+popcount = int.bit_count if hasattr(int, "bit_count") else lambda bb: bin(bb).count("1")
+
+
+def squares(bb: int) -> list[int]:
+    """
+    List the square indices of the set bits of a bitboard, lowest first.
+
+    Args:
+        bb (int): The bitboard
+
+    Returns:
+        list[int]: Square indices
+    """
+    # Peel off the highest bit: bit_length gives its index directly, without isolating it first
+    result = []
+    while bb:
+        square = bb.bit_length() - 1
+        result.append(square)
+        bb ^= BIT[square]
+    result.reverse()
+    return result
+
+
+def to_mask(bb: int) -> np.ndarray:
+    """
+    Expand a bitboard into an 8x8 boolean array (row-major, zero-indexed).
+
+    Args:
+        bb (int): The bitboard
+
+    Returns:
+        np.ndarray: Boolean 8x8 mask, True where the bit is set
+    """
+    as_bytes = np.array([bb], dtype="<u8").view(np.uint8)
+    return np.unpackbits(as_bytes, bitorder="little").astype(bool).reshape(8, 8)
@@ -1,5 +1,5 @@
 from OthelloEvaluator import OthelloEvaluator
-import numpy as np
+from Bitboard import popcount
 
 """
   A simple evaluator that just counts the number of black and white squares 
@@ -14,14 +14,12 @@ class CountingEvaluator(OthelloEvaluator):
         self.playing_white = playing_white
 
     def evaluate(self, othello_position):
-        white_mask = othello_position.board == 'W'
-        black_mask = othello_position.board == 'B'
+        white_squares = popcount(othello_position.white_bitboard)
+        black_squares = popcount(othello_position.black_bitboard)
 
-        black_squares = np.sum(black_mask)
-        white_squares = np.sum(white_mask)
-
-
-        if othello_position.maxPlayer:
+        # Scored from the starting player's side, like HeuristicEvaluator: the search negates
+        # the score itself at the opponent's nodes
+        if self.playing_white:
             return white_squares - black_squares
         else:
             return black_squares - white_squares
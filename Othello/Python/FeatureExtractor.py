@@ -1,5 +1,46 @@
 import numpy as np
 from OthelloPosition import OthelloPosition
+from Bitboard import generate_moves, neighbours, popcount, FULL
+
+
+def _to_bitboard(positions: np.ndarray) -> int:
+    """
+    Convert zero-indexed (row, col) positions to a bitboard.
+
+    Args:
+        positions (np.ndarray): Array of (row, col) pairs
+
+    Returns:
+        int: Bitboard with the bit of every position set
+    """
+    bitboard = 0
+    for row, col in positions:
+        bitboard |= 1 << int(row * 8 + col)
+    return bitboard
+
+
+# Corners (most valuable squares)
+CORNER_POSITIONS = np.array([[0, 0], [0, 7], [7, 0], [7, 7]])
+
+# X-squares (diagonal squares next to corners, highly dangerous)
+X_SQUARE_POSITIONS = np.array([[1, 1], [1, 6], [6, 1], [6, 6]])
+
+# C-squares (squares directly beside the corners, risky in early game because you risk giving up a corner)
+C_SQUARE_POSITIONS = np.array(
+    [
+        [0, 1], [0, 6], [1, 0], [1, 7],  # top
+        [6, 0], [6, 7], [7, 1], [7, 6],  # bottom
+    ]
+)
+
+# Edge positions (excluding corners)
+EDGE_POSITIONS = np.array([p for i in range(1, 7) for p in ([0, i], [7, i], [i, 0], [i, 7])])
+
+# The square sets as bitboards, so a feature is a single AND + popcount
+CORNER_MASK = _to_bitboard(CORNER_POSITIONS)
+X_SQUARE_MASK = _to_bitboard(X_SQUARE_POSITIONS)
+C_SQUARE_MASK = _to_bitboard(C_SQUARE_POSITIONS)
+EDGE_MASK = _to_bitboard(EDGE_POSITIONS)
 
 
 class FeatureExtractor:
@@ -44,42 +85,20 @@ class FeatureExtractor:
             x_square_positions (np.ndarray): X-square positions, the diagonal squares next to corners.
             c_square_positions (np.ndarray): C-square positions, squares directly beside the corners.
             edge_positions (np.ndarray): Edge positions, squares along the borders but excluding corners.
+            corner_mask, x_square_mask, c_square_mask, edge_mask (int): The same square sets as bitboards.
             feature_names (list): List of feature names for interpretability
         """
         self.playing_white = playing_white
 
-        # Corners (most valuable squares)
-        self.corner_positions = np.array([[0, 0], [0, 7], [7, 0], [7, 7]])
-
-        # X-squares (diagonal squares next to corners, highly dangerous)
-        self.x_square_positions = np.array([[1, 1], [1, 6], [6, 1], [6, 6]])
-
-        # C-squares (squares directly beside the corners, risky in early game because you risk giving up a corner)
-        self.c_square_positions = np.array(
-            [
-                [0, 1], [0, 6], [1, 0], [1, 7],  # top
-                [6, 0], [6, 7], [7, 1], [7, 6],  # bottom
-            ]
-        )
-
-        # Edge positions (excluding corners)
-        edge_positions = []
-        for i in range(1, 7):
-            edge_positions.extend([[0, i], [7, i], [i, 0], [i, 7]])
-        self.edge_positions = np.array(edge_positions)
-
-
-        # Define 8 directions: N, NE, E, SE, S, SW, W, NW
-        self.directions = [
-            (-1, 0),
-            (-1, 1),
-            (0, 1),
-            (1, 1),
-            (1, 0),
-            (1, -1),
-            (0, -1),
-            (-1, -1),
-        ]
+        # The square sets are the same for every extractor, so they are built once at import
+        self.corner_positions = CORNER_POSITIONS
+        self.x_square_positions = X_SQUARE_POSITIONS
+        self.c_square_positions = C_SQUARE_POSITIONS
+        self.edge_positions = EDGE_POSITIONS
+        self.corner_mask = CORNER_MASK
+        self.x_square_mask = X_SQUARE_MASK
+        self.c_square_mask = C_SQUARE_MASK
+        self.edge_mask = EDGE_MASK
 
         # feature names
         self.feature_names = [
@@ -122,72 +141,65 @@ class FeatureExtractor:
             All differences are calculated from the starting player's perspective.
             Positive values generally favor the starting player.
         """
+        return np.array(self.feature_values(position), dtype=np.float64)
 
-        features = []
+    def feature_values(self, position: OthelloPosition) -> list:
+        """
+        Compute the same 10 features as extract_features, as a plain list of Python ints.
+
+        The features are popcounts of bitboards, so they are computed without numpy; this
+        is the version the evaluator calls at every leaf of the search.
+
+        Args:
+            position (OthelloPosition): The current Othello game position to analyze
+
+        Returns:
+            list: The 10 features, in the order documented in extract_features
+        """
 
-        # use zero-based indexing and exclude the padding - 8x8 np array
-        board = position.board[1:9, 1:9].copy()
+        features = []
 
-        # Piece types for current player and opponent
-        my_piece = "W" if self.playing_white else "B"
-        opp_piece = "B" if self.playing_white else "W"
+        # Bitboards of both sides, from the starting player's perspective
+        if self.playing_white:
+            my_bb, opp_bb = position.white_bitboard, position.black_bitboard
+        else:
+            my_bb, opp_bb = position.black_bitboard, position.white_bitboard
 
-        # Boolean masks for piece counting
-        my_mask = board == my_piece
-        opp_mask = board == opp_piece
-        empty_mask = board == "E"
+        empty_bb = ~(my_bb | opp_bb) & FULL
 
         # Count pieces
-        my_pieces = np.sum(my_mask)
-        opp_pieces = np.sum(opp_mask)
+        my_pieces = popcount(my_bb)
+        opp_pieces = popcount(opp_bb)
         total_pieces = my_pieces + opp_pieces
 
         # 1. Piece difference
         features.append(my_pieces - opp_pieces)
 
-        # 2. Mobility difference
-
-        # Get current player's mobility
-        my_mobility = len(position.get_moves())
-        
-        # Get opponent's mobility 
-        opponent = position.clone()
-        opponent.maxPlayer = not position.maxPlayer
-        opp_mobility = len(opponent.get_moves())
-
-        # Calculate mobility difference from starting player's perspective
-        if (self.playing_white and position.maxPlayer) or (not self.playing_white and not position.maxPlayer):
-            # Starting player is the current player
-            mobility_diff = my_mobility - opp_mobility
-        else:
-            # Starting player is the opponent
-            mobility_diff = opp_mobility - my_mobility
-            
-        features.append(mobility_diff)
+        # 2. Mobility difference (legal moves of each side, whoever is to move)
+        my_mobility = popcount(generate_moves(my_bb, opp_bb))
+        opp_mobility = popcount(generate_moves(opp_bb, my_bb))
+        features.append(my_mobility - opp_mobility)
 
         # 3. Corner control difference
-        my_corners = np.sum(my_mask[self.corner_positions[:, 0], self.corner_positions[:, 1]])
-        opp_corners = np.sum(opp_mask[self.corner_positions[:, 0], self.corner_positions[:, 1]])
+        my_corners = popcount(my_bb & self.corner_mask)
+        opp_corners = popcount(opp_bb & self.corner_mask)
         features.append(my_corners - opp_corners)
 
         # 4. X-square difference (dangerous position for current player, neg is better)
-        my_x_squares = np.sum(my_mask[self.x_square_positions[:, 0], self.x_square_positions[:, 1]])
-        opp_x_squares = np.sum(opp_mask[self.x_square_positions[:, 0], self.x_square_positions[:, 1]])
-        features.append(my_x_squares - opp_x_squares)
+        features.append(popcount(my_bb & self.x_square_mask) - popcount(opp_bb & self.x_square_mask))
 
         # 5. C-square difference (dangerous position for current player, neg is better)
-        my_c_squares = np.sum(my_mask[self.c_square_positions[:, 0], self.c_square_positions[:, 1]])
-        opp_c_squares = np.sum(opp_mask[self.c_square_positions[:, 0], self.c_square_positions[:, 1]])
-        features.append(my_c_squares - opp_c_squares)
+        features.append(popcount(my_bb & self.c_square_mask) - popcount(opp_bb & self.c_square_mask))
 
         # 6. Edge control difference
-        my_edges = np.sum(my_mask[self.edge_positions[:, 0], self.edge_positions[:, 1]])
-        opp_edges = np.sum(opp_mask[self.edge_positions[:, 0], self.edge_positions[:, 1]])
+        my_edges = popcount(my_bb & self.edge_mask)
+        opp_edges = popcount(opp_bb & self.edge_mask)
         features.append(my_edges - opp_edges)
 
         # 7. Frontier discs
-        my_frontier = self.__count_frontier_discs(my_mask, empty_mask)
-        opp_frontier = self.__count_frontier_discs(opp_mask, empty_mask)
+        next_to_empty = neighbours(empty_bb)
+        my_frontier = self.__count_frontier_discs(my_bb, next_to_empty)
+        opp_frontier = self.__count_frontier_discs(opp_bb, next_to_empty)
         features.append(my_frontier - opp_frontier)
 
         # 8. Parity score (we always want to have the last move and reduce our opponent's degree of freedom)
@@ -195,20 +207,18 @@ class FeatureExtractor:
         features.append(parity_score)
 
         # 9. Stability difference (the higher the better)
-        my_stability = self.__estimate_stability(my_mask)
-        opp_stability = self.__estimate_stability(opp_mask)
+        my_stability = self.__estimate_stability(my_corners, my_edges)
+        opp_stability = self.__estimate_stability(opp_corners, opp_edges)
         features.append(my_stability - opp_stability)
 
         # 10. Potential mobility (empty squares next to opponent)
-        my_potential = self.__count_potential_mobility(opp_mask, empty_mask)
-        opp_potential = self.__count_potential_mobility(my_mask, empty_mask)
+        my_potential = self.__count_potential_mobility(opp_bb, empty_bb)
+        opp_potential = self.__count_potential_mobility(my_bb, empty_bb)
         features.append(my_potential - opp_potential)
 
+        return features
 
-        return np.array(features, dtype=np.float64)
-
-
-    def __count_frontier_discs(self, piece_mask: np.ndarray, empty_mask: np.ndarray) -> int:
+    def __count_frontier_discs(self, bitboard: int, next_to_empty: int) -> int:
         """
         Count frontier discs (pieces adjacent to empty squares).
 
@@ -219,8 +229,8 @@ class FeatureExtractor:
         3. They reduce your own mobility
 
         Args:
-            piece_mask (np.ndarray): Boolean 8x8 mask where True indicates pieces of interest
-            empty_mask (np.ndarray): Boolean 8x8 mask where True indicates empty squares
+            bitboard (int): Bitboard of the pieces of interest
+            next_to_empty (int): Bitboard of the squares adjacent to at least one empty square
 
         Returns:
             int: Number of frontier discs (pieces adjacent to empty squares)
@@ -228,31 +238,7 @@ class FeatureExtractor:
         Reference:
             Rose, B. (2005). "Othello and A Minute to Learn...A Lifetime to Master."
         """
-        # Define 8 directions: N, NE, E, SE, S, SW, W, NW
-        directions = [
-            (-1, 0),
-            (-1, 1),
-            (0, 1),
-            (1, 1),
-            (1, 0),
-            (1, -1),
-            (0, -1),
-            (-1, -1),
-        ]
-
-        # Handle boundary checks, no need to worry about indexing out of range.
-        padded_empty = np.pad(empty_mask, 1, mode="constant", constant_values=False)
-
-        frontier_mask = np.zeros_like(piece_mask, dtype=bool)
-
-        for dr, dc in directions:
-            # Shift the empty mask in the opposite direction to find pieces adjacent to empty squares
-            shifted_empty = padded_empty[1 + dr : 9 + dr, 1 + dc : 9 + dc]
-
-            # Mark pieces that are adjacent to empty squares in this direction
-            frontier_mask |= piece_mask & shifted_empty
-
-        return np.sum(frontier_mask)
+        return popcount(bitboard & next_to_empty)
 
     def __calculate_parity(self, total_pieces: int, my_pieces: int, opp_pieces: int) -> int:
         """
@@ -306,7 +292,7 @@ class FeatureExtractor:
             else:
                 return 0
 
-    def __estimate_stability(self, piece_mask: np.ndarray) -> int:
+    def __estimate_stability(self, corner_count: int, edge_count: int) -> int:
         """
         Estimate disc stability using a simplified heuristic approach.
 
@@ -320,7 +306,8 @@ class FeatureExtractor:
         by checking if pieces are connected to stable pieces in all directions.
 
         Args:
-            piece_mask (np.ndarray): Boolean 8x8 mask where True indicates pieces of interest
+            corner_count (int): Number of corners held by the pieces of interest
+            edge_count (int): Number of edge squares (excluding corners) held by the pieces of interest
 
         Returns:
             int: Estimated stability score (higher is more stable)
@@ -330,16 +317,14 @@ class FeatureExtractor:
         """
 
         # Corners are always stable (weight them more heavily)
-        corner_count = np.sum(piece_mask[self.corner_positions[:, 0], self.corner_positions[:, 1]])
         stable_count = corner_count * 3
 
         # Edges are somewhat stable
-        edge_count = np.sum(piece_mask[self.edge_positions[:, 0], self.edge_positions[:, 1]])
         stable_count += edge_count
 
         return stable_count
 
-    def __count_potential_mobility(self, opp_mask: np.ndarray, empty_mask: np.ndarray) -> int:
+    def __count_potential_mobility(self, opp_bitboard: int, empty_bitboard: int) -> int:
         """
         Count potential mobility (empty squares adjacent to opponent pieces).
 
@@ -351,8 +336,8 @@ class FeatureExtractor:
         3. It suggests they may gain mobility as the game progresses
 
         Args:
-            opp_mask (np.ndarray): Boolean 8x8 mask where True indicates opponent pieces
-            empty_mask (np.ndarray): Boolean 8x8 mask where True indicates empty squares
+            opp_bitboard (int): Bitboard of the opponent pieces
+            empty_bitboard (int): Bitboard of the empty squares
 
         Returns:
             int: Number of empty squares adjacent to opponent pieces
@@ -361,18 +346,4 @@ class FeatureExtractor:
             M. Buro, "An evaluation function for Othello based on statistics,"
             Technical Report, NEC Research Institute, Princeton, NJ, 1995.
         """
-
-        # Handle boundary checks, no need to worry about indexing out of range.
-        padded_opp = np.pad(opp_mask, 1, mode="constant", constant_values=False)
-
-        # Track all empty squares adjacent to opponent pieces
-        adjacent_empty_mask = np.zeros_like(empty_mask, dtype=bool)
-
-        for dr, dc in self.directions:
-            # Shift opponent pieces in each direction to find adjacent empty squares
-            shifted_opp = padded_opp[1 + dr : 9 + dr, 1 + dc : 9 + dc]
-
-            # Mark empty squares that are adjacent to opponent pieces
-            adjacent_empty_mask |= empty_mask & shifted_opp
-
-        return np.sum(adjacent_empty_mask)
\ No newline at end of file
+        return popcount(empty_bitboard & neighbours(opp_bitboard))
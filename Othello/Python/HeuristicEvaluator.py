@@ -14,14 +14,13 @@ Key Features:
 - 10 strategic features extracted from board positions
 - Optimized weights determined through strategic analysis
 - Mobility-focused strategy to counter naive opponents
-- Efficient numpy-based computations
+- Efficient bitboard-based computations
 - Move prioritization for alpha-beta optimization
 
 Author: Afrasah Benjamin Arko
 """
 
-import numpy as np
-from typing import Optional
+from operator import mul
 from OthelloEvaluator import OthelloEvaluator
 from OthelloPosition import OthelloPosition
 from FeatureExtractor import FeatureExtractor
@@ -36,22 +35,46 @@ class HeuristicEvaluator(OthelloEvaluator):
     through game theory principles and strategic analysis.
     
     The evaluator implements a mobility-dominant strategy that prioritizes:
-    - Corner control (highest weight: 600.0)
+    - Corner control (highest weight: 600)
     - Mobility and potential mobility
     - Stability and positional advantages
     - Penalties for dangerous squares (X-squares, C-squares)
     
     Attributes:
         feature_extractor (FeatureExtractor): Extracts strategic features from positions
-        weights (np.ndarray): Optimized weights for each feature (10 features)
+        weights (tuple): Optimized weights for each feature (10 features), as Python ints
+        cache (dict): Scores of already evaluated boards
 
     """
 
+    # Mobility-dominant weights optimized for strategic play. They are whole numbers, so they are
+    # kept as Python ints: the features are ints too, and int products are cheaper to sum than
+    # float ones (see evaluate)
+    DefaultWeights = (
+        100,  # piece_diff - moderate importance
+        100,  # mobility_diff - high importance for current moves
+        600,  # corner_diff - highest importance for stability
+        -50,  # x_square_diff - high penalty for dangerous squares
+        -5,   # c_square_diff - moderate penalty for risky squares
+        70,   # edge_diff - good importance for edge control
+        -10,  # frontier_diff - penalty for vulnerable pieces
+        18,   # parity_score - tempo advantage consideration
+        90,   # stability_diff - high importance for piece stability
+        6,    # potential_mobility_diff - future move potential
+    )
+    DefaultBias = 1.0
+
+    # Maximum number of cached evaluations before the cache is emptied
+    CacheSize = 1 << 20
+
     def __init__(self, playing_white: bool) -> None:
         self.feature_extractor = FeatureExtractor(playing_white)
-        self.weights: Optional[np.ndarray] = None
+        self.weights: tuple = ()
         self.bias: float = 0.0
         self.playing_white: bool = playing_white
+        # (white bitboard, black bitboard) -> score. The features do not depend on the player
+        # to move, so transpositions reached with either side to move share an entry.
+        self.cache: dict = {}
 
         self._initialize_default_weights()
 
@@ -64,31 +87,19 @@ class HeuristicEvaluator(OthelloEvaluator):
         and corner control while avoiding dangerous square occupations.
         
         Weight breakdown:
-        - piece_diff (100.0): Moderate importance for piece count
-        - mobility_diff (100.0): High importance for current move options
-        - corner_diff (600.0): Highest importance for corner control
-        - x_square_diff (-50.0): High penalty for dangerous X-squares
-        - c_square_diff (-5.0): Moderate penalty for C-squares
-        - edge_diff (70.0): Good importance for edge control
-        - frontier_diff (-10.0): Penalty for vulnerable frontier pieces
-        - parity_score (18.0): Tempo advantage consideration
-        - stability_diff (90.0): High importance for piece stability
-        - potential_mobility_diff (6.0): Future move potential
+        - piece_diff (100): Moderate importance for piece count
+        - mobility_diff (100): High importance for current move options
+        - corner_diff (600): Highest importance for corner control
+        - x_square_diff (-50): High penalty for dangerous X-squares
+        - c_square_diff (-5): Moderate penalty for C-squares
+        - edge_diff (70): Good importance for edge control
+        - frontier_diff (-10): Penalty for vulnerable frontier pieces
+        - parity_score (18): Tempo advantage consideration
+        - stability_diff (90): High importance for piece stability
+        - potential_mobility_diff (6): Future move potential
         """
-        # Mobility-dominant weights optimized for strategic play
-        self.weights = np.array([
-            100.0,  # piece_diff - moderate importance
-            100.0,  # mobility_diff - high importance for current moves
-            600.0,  # corner_diff - highest importance for stability
-            -50.0,  # x_square_diff - high penalty for dangerous squares
-            -5.0,   # c_square_diff - moderate penalty for risky squares
-            70.0,   # edge_diff - good importance for edge control
-            -10,     # frontier_diff - penalty for vulnerable pieces
-            18,     # parity_score - tempo advantage consideration
-            90.0,   # stability_diff - high importance for piece stability
-            6,      # potential_mobility_diff - future move potential
-        ])
-        self.bias = 1.0
+        self.weights = self.DefaultWeights
+        self.bias = self.DefaultBias
 
     def evaluate(self, othello_position: OthelloPosition) -> float:
         """
@@ -109,11 +120,21 @@ class HeuristicEvaluator(OthelloEvaluator):
                    - Negative values favor the opponent
                    - Magnitude indicates strength of advantage
         """
+        key = (othello_position.white_bitboard, othello_position.black_bitboard)
+        score = self.cache.get(key)
+        if score is not None:
+            return score
+
         # Extract strategic features from the position
-        features = self.feature_extractor.extract_features(othello_position)
-        
-        # Compute weighted linear combination
-        score = np.dot(self.weights, features) + self.bias
+        features = self.feature_extractor.feature_values(othello_position)
         
+        # Compute weighted linear combination. Weights and features are short sequences of Python
+        # ints, so the weighted sum is exact int arithmetic, cheaper than converting them to arrays
+        # for np.dot; adding the float bias gives the Python float the search compares at every node
+        score = sum(map(mul, self.weights, features)) + self.bias
+
+        if len(self.cache) >= self.CacheSize:
+            self.cache.clear()
+        self.cache[key] = score
         return score
 
@@ -1,85 +1,155 @@
 import time
+
+# The time limit covers the whole process, so start the clock before the (numpy) imports
+start = time.time()
+
 import sys
+import importlib
 from OthelloPosition import OthelloPosition
+from OthelloAction import OthelloAction
 from AlphaBeta import AlphaBeta, StopSignal
-from HeuristicEvaluator import HeuristicEvaluator
+
+# Evaluators that can be chosen on the command line: name -> module (and class) name.
+# Only the chosen one is imported. Each is constructed with the root player's colour and
+# scores positions from that player's side, which is what AlphaBeta.negamax expects.
+EVALUATORS = {
+    "heuristic": "HeuristicEvaluator",
+    "counting": "CountingEvaluator",
+}
 
 
 class Othello(object):
     """
     Example of a main class for Othello that starts the game.
-    This version only searches to a fixed depth. You need to implement 
-    Iterative Deepening Search using the time limit argument.
-    
+    Searches the position with iterative deepening until the time limit runs out.
+
     Author: Ola Ringdahl
 
     Args:
         arg1: Position to evaluate (a string of length 65 representing the board).
         arg2: Time limit in seconds
+        arg3: Optional evaluator name, one of EVALUATORS (default: heuristic)
     """
-    if len(sys.argv) > 1:
-        try:
-            posString = sys.argv[1]
-        except ValueError:
-            print("Error: Position must be a string")
-            exit(1)
-        except IndexError:
-            print("Error: Position must be provided")
-            exit(1)
-        try:
-            time_limit = float(sys.argv[2])
-        except ValueError:
-            print("Error: Time limit must be a number")
-            exit(1)
-        except IndexError:
-            print("Error: Time limit must be provided")
-            exit(1)
-    else:
-        posString = (
-            "BEXEXOOOXEEXXOEXEEEEOOXOEEEOOOEEEEOOOOEEEEEXOEEEEEEEEEEEEEEEEEEEE"
-        )
-        time_limit = 1
-    start = time.time()
-    pos = OthelloPosition(posString)
-    # pos.print_board() # Only for debugging. The test script has it's own print
-
-    algorithm = AlphaBeta(HeuristicEvaluator(pos.maxPlayer))
-    move = None
-
-    # Apply time buffer - be more aggressive with time usage
-    time_limit = time_limit * 0.90
-
-    # Iterative deepening: start from depth 1 and increment
-    current_depth = 1
-    depth_reached = 0
-
-    while time.time() - start < time_limit:
-
-        algorithm.set_search_depth(current_depth)
-        elapsed_time = time.time() - start
-        remaining_time = time_limit - elapsed_time
-
-        # # Don't start a new depth if we don't have enough time
-        # if remaining_time < 0.05:  # Need at least 0.05 seconds
-        #     break
-
-        # Evaluate the position
-        algorithm.set_time_limit(remaining_time)
-
-        try:
-            # Search to current depth
-            move = algorithm.evaluate(pos)
-            depth_reached = current_depth
-            current_depth += 1
-        except StopSignal:
-            # Time limit exceeded during current depth search
-            break
-
-    # Send the chosen move to stdout (print it)
-    move.print_move()
-
-    if not move.is_pass_move:
-        print(f"Depth reached: {depth_reached}, Nodes searched: {algorithm.nodes_searched}")
-
-    end = time.time()
-    # print(end - start) # Only for debugging, print nothing but the move in the final version
+
+    # Share of the time limit the search may use, the rest is margin for startup and output
+    TimeBuffer = 0.90
+
+    @staticmethod
+    def run_search(pos: OthelloPosition, algorithm: AlphaBeta, time_limit: float, start: float):
+        """
+        Search a position with iterative deepening until the time runs out.
+
+        Args:
+            pos (OthelloPosition): The position to search
+            algorithm (AlphaBeta): The search algorithm, reused across depths
+            time_limit (float): Time available in seconds, counted from start
+            start (float): Time the clock was started
+
+        Returns:
+            tuple: (OthelloAction, int) the move to play and the deepest completed depth
+        """
+        move = None
+
+        # Iterative deepening: start from depth 1 and increment
+        current_depth = 1
+        depth_reached = 0
+        # No point searching deeper than the end of the game. Every move fills an empty square, and
+        # a pass is a ply that fills none; two passes in a row end the game, so a line has at most
+        # one pass per move and reaches the end within twice the number of empty squares
+        max_depth = max(2 * pos.count_empty(), 1)
+        # Wall time of every completed depth, used to predict the cost of the next one
+        depth_times = []
+        root_squares = pos.get_move_squares()
+
+        # With a single legal move (or none, i.e. a pass) there is nothing to search for
+        while len(root_squares) > 1 and current_depth <= max_depth and time.time() - start < time_limit:
+
+            algorithm.set_search_depth(current_depth)
+            elapsed_time = time.time() - start
+            remaining_time = time_limit - elapsed_time
+
+            # Don't start a new depth that is predicted not to finish: each depth costs about the
+            # effective branching factor (ratio of the last two depth times) times the previous one
+            if depth_times:
+                ebf = depth_times[-1] / depth_times[-2] if len(depth_times) >= 2 and depth_times[-2] > 0 else 8.0
+                if depth_times[-1] * ebf > remaining_time:
+                    break
+
+            # Evaluate the position (the algorithm and its transposition table are reused across depths)
+            algorithm.clear_search_state()
+            algorithm.set_time_limit(remaining_time)
+
+            try:
+                # Search to current depth
+                # The previous iteration's best move is searched first at the root, with a
+                # narrow window around its score
+                iteration_start = time.time()
+                move = algorithm.aspiration_search(pos, None if move is None else move.value, pv_hint=move)
+                depth_times.append(time.time() - iteration_start)
+                depth_reached = current_depth
+                current_depth += 1
+            except StopSignal:
+                # Time limit exceeded during current depth search
+                break
+
+        if move is None:
+            # Forced move, or not even depth 1 finished in time: play the legal move with the best
+            # static priority
+            if root_squares:
+                square = max(root_squares, key=algorithm.square_priority.__getitem__)
+                move = OthelloAction(square // 8 + 1, square % 8 + 1)
+            else:
+                move = OthelloAction(0, 0, True)
+
+        return move, depth_reached
+
+    @staticmethod
+    def main():
+        """
+        Read the position, time limit and evaluator from the command line, search and print the move.
+        """
+        if len(sys.argv) > 1:
+            try:
+                posString = sys.argv[1]
+            except ValueError:
+                print("Error: Position must be a string")
+                exit(1)
+            except IndexError:
+                print("Error: Position must be provided")
+                exit(1)
+            try:
+                time_limit = float(sys.argv[2])
+            except ValueError:
+                print("Error: Time limit must be a number")
+                exit(1)
+            except IndexError:
+                print("Error: Time limit must be provided")
+                exit(1)
+            evaluator_name = sys.argv[3] if len(sys.argv) > 3 else "heuristic"
+            if evaluator_name not in EVALUATORS:
+                print("Error: Evaluator must be one of " + ", ".join(EVALUATORS))
+                exit(1)
+        else:
+            posString = (
+                "BEXEXOOOXEEXXOEXEEEEOOXOEEEOOOEEEEOOOOEEEEEXOEEEEEEEEEEEEEEEEEEEE"
+            )
+            time_limit = 1
+            evaluator_name = "heuristic"
+        pos = OthelloPosition(posString)
+        # pos.print_board() # Only for debugging. The test script has it's own print
+
+        evaluator_module = EVALUATORS[evaluator_name]
+        evaluator_class = getattr(importlib.import_module(evaluator_module), evaluator_module)
+        algorithm = AlphaBeta(evaluator_class(pos.maxPlayer))
+
+        move, depth_reached = Othello.run_search(pos, algorithm, time_limit * Othello.TimeBuffer, start)
+
+        # Send the chosen move to stdout (print it)
+        move.print_move()
+
+        if not move.is_pass_move:
+            print(f"Depth reached: {depth_reached}, Nodes searched: {algorithm.nodes_searched}")
+
+
+if __name__ == "__main__":
+    Othello.main()
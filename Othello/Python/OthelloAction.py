@@ -9,6 +9,8 @@ class OthelloAction(object):
       Author: Ola Ringdahl
     """
 
+    __slots__ = ("row", "col", "is_pass_move", "value")
+
     def __init__(self, row, col, is_pass_move=False):
         """
         Creates a new OthelloAction for (row, col) with value 0.
@@ -1,5 +1,91 @@
 from abc import ABC, abstractmethod
 from OthelloAction import OthelloAction
+from OthelloPosition import PASS_MOVE
+
+
+def _square_priority(row_idx: int, col_idx: int) -> int:
+    """
+    Static move ordering priority of a square, see OthelloEvaluator.move_priority.
+
+    Args:
+        row_idx (int): Zero-indexed row
+        col_idx (int): Zero-indexed column
+
+    Returns:
+        int: Priority value for move ordering
+    """
+    # Corner moves get highest priority
+    if (row_idx, col_idx) in [(0, 0), (0, 7), (7, 0), (7, 7)]:
+        return 1000
+
+    # X squares get lowest priority (most dangerous)
+    elif (row_idx, col_idx) in [(1, 1), (1, 6), (6, 1), (6, 6)]:
+        return -1000
+
+    # C squares get low priority (dangerous)
+    elif (row_idx, col_idx) in [
+        (0, 1),
+        (1, 0),
+        (0, 6),
+        (1, 7),
+        (6, 0),
+        (7, 1),
+        (7, 6),
+        (6, 7),
+    ]:
+        return -500
+
+    # Edge moves get medium priority
+    elif (row_idx, col_idx) in [
+        (0, 2),
+        (0, 3),
+        (0, 4),
+        (0, 5),
+        (2, 0),
+        (3, 0),
+        (4, 0),
+        (5, 0),
+        (7, 2),
+        (7, 3),
+        (7, 4),
+        (7, 5),
+        (2, 7),
+        (3, 7),
+        (4, 7),
+        (5, 7),
+    ]:
+        return 100
+
+    # Center moves get lower priority
+    elif (row_idx, col_idx) in [
+        (2, 2),
+        (2, 3),
+        (2, 4),
+        (2, 5),
+        (3, 2),
+        (3, 3),
+        (3, 4),
+        (3, 5),
+        (4, 2),
+        (4, 3),
+        (4, 4),
+        (4, 5),
+        (5, 2),
+        (5, 3),
+        (5, 4),
+        (5, 5),
+    ]:
+        return 10
+
+    # Every other square gets neutral priority
+    else:
+        return 1
+
+
+# Priority of every square index, computed once so move_priority is a single lookup (AlphaBeta
+# calls it once per square when the evaluator is set, see AlphaBeta.set_evaluator). The extra
+# last entry is the priority of a pass: PASS_MOVE is -1, so it indexes that entry directly.
+SQUARE_PRIORITY = tuple(_square_priority(square // 8, square % 8) for square in range(64)) + (float("-inf"),)
 
 
 class OthelloEvaluator(ABC):
@@ -44,77 +130,7 @@ class OthelloEvaluator(ABC):
         Returns:
             float: Priority value for move ordering
         """
-        # Pass moves get lowest priority
+        # X and C squares, corners, edges and passes are all classified in the table
         if action.is_pass_move:
-            return float("-inf")
-
-        # Convert 1-indexed coordinates to 0-indexed for mask lookup
-        row_idx = action.row - 1
-        col_idx = action.col - 1
-
-        # Corner moves get highest priority
-        if (row_idx, col_idx) in [(0, 0), (0, 7), (7, 0), (7, 7)]:
-            return 1000
-
-        # X squares get lowest priority (most dangerous)
-        elif (row_idx, col_idx) in [(1, 1), (1, 6), (6, 1), (6, 6)]:
-            return -1000
-
-        # C squares get low priority (dangerous)
-        elif (row_idx, col_idx) in [
-            (0, 1),
-            (1, 0),
-            (0, 6),
-            (1, 7),
-            (6, 0),
-            (7, 1),
-            (7, 6),
-            (6, 7),
-        ]:
-            return -500
-
-        # Edge moves get medium priority
-        elif (row_idx, col_idx) in [
-            (0, 2),
-            (0, 3),
-            (0, 4),
-            (0, 5),
-            (2, 0),
-            (3, 0),
-            (4, 0),
-            (5, 0),
-            (7, 2),
-            (7, 3),
-            (7, 4),
-            (7, 5),
-            (2, 7),
-            (3, 7),
-            (4, 7),
-            (5, 7),
-        ]:
-            return 100
-
-        # Center moves get lower priority
-        elif (row_idx, col_idx) in [
-            (2, 2),
-            (2, 3),
-            (2, 4),
-            (2, 5),
-            (3, 2),
-            (3, 3),
-            (3, 4),
-            (3, 5),
-            (4, 2),
-            (4, 3),
-            (4, 4),
-            (4, 5),
-            (5, 2),
-            (5, 3),
-            (5, 4),
-            (5, 5),
-        ]:
-            return 10
-
-        # Every other square gets neutral priority
-        else:
-            return 1
+            return SQUARE_PRIORITY[PASS_MOVE]
+        return SQUARE_PRIORITY[(action.row - 1) * 8 + (action.col - 1)]
@@ -1,20 +1,54 @@
 import numpy as np
 from OthelloAction import OthelloAction
+from Bitboard import generate_moves, flips, squares, to_mask, popcount, BIT, FULL
+
+# Moves inside the search are plain square indices, (row - 1) * 8 + (col - 1), with PASS_MOVE for a pass
+PASS_MOVE = -1
+
+# Zobrist keys: one random 64-bit number per (colour, square) plus one for the side to move.
+# Kept as Python ints so the incremental XOR updates in make_move stay cheap.
+_zobrist_rng = np.random.default_rng(20250928)
+ZOBRIST_WHITE, ZOBRIST_BLACK = _zobrist_rng.integers(0, 2**63, size=(2, 64), dtype=np.uint64).tolist()
+ZOBRIST_FLIP = [w ^ b for w, b in zip(ZOBRIST_WHITE, ZOBRIST_BLACK)]  # XOR for a disc changing colour
+ZOBRIST_SIDE = int(_zobrist_rng.integers(0, 2**63, dtype=np.uint64))
+
+
+class _Digits(dict):
+    """
+    Translation table for str.translate that maps every character it does not list to "0".
+    """
+
+    def __missing__(self, char):
+        return "0"
+
+
+# Turn the cells of a position string into the binary digits of one colour's bitboard. Any cell
+# other than O (white) or X (black) is empty, as 'E' is
+_WHITE_DIGITS = _Digits(str.maketrans("O", "1"))
+_BLACK_DIGITS = _Digits(str.maketrans("X", "1"))
 
 
 class OthelloPosition(object):
     """
-    This class is used to represent game positions. It uses a 2-dimensional char array for the board
-    and a Boolean to keep track of which player has the move.
+    This class is used to represent game positions. It uses two bitboards (one 64-bit int per colour)
+    for the discs and a Boolean to keep track of which player has the move.
 
-    For convenience, the array actually has two columns and two rows more that the actual game board.
-    The 'middle' is used for the board. The first index is for rows, and the second for columns.
+    Bit (row - 1) * 8 + (col - 1) of white_bitboard / black_bitboard is set when (row, col) holds a white /
+    black disc, see Bitboard.py. Moves are generated and made with whole-board shift operations.
+
+    For printing and for evaluators working on arrays, the position can still be viewed as a 2-dimensional
+    char array (board). For convenience, the array actually has two columns and two rows more that the actual
+    game board. The 'middle' is used for the board. The first index is for rows, and the second for columns.
     This means that for a standard 8x8 game board, board[1][1] represents the upper left corner,
     board[1][8] the upper right corner, board[8][1] the lower left corner, and board[8][8] the lower left corner.
 
     Author: Ola Ringdahl
     """
 
+    # Fixed set of fields: keeps positions small and their attribute access fast, since the search
+    # reads and writes them at every make/undo
+    __slots__ = ("BOARD_SIZE", "maxPlayer", "flipped_count", "white_bitboard", "black_bitboard", "zobrist")
+
     def __init__(self, board_str=""):
         """
         Creates a new position according to str. If str is not given all squares are set to E (empty)
@@ -26,44 +60,28 @@ class OthelloPosition(object):
         """
         self.BOARD_SIZE = 8
         self.maxPlayer = True  # True = White to move, False = Black to move
-        # 8 directions: N, NE, E, SE, S, SW, W, NW
-        self.DIRS = [
-            (-1, 0),
-            (-1, 1),
-            (0, 1),
-            (1, 1),
-            (1, 0),
-            (1, -1),
-            (0, -1),
-            (-1, -1),
-        ]
-
-        # Use dtype='U1' (1-char Unicode) to keep memory small & fast.
-        self.board = np.full(
-            (self.BOARD_SIZE + 2, self.BOARD_SIZE + 2), "E", dtype="U1"
-        )
+        self.flipped_count = 0  # Discs flipped by the move that produced this position
+        self.white_bitboard = 0
+        self.black_bitboard = 0
+
         if len(board_str) >= 65:
             # Set player to move
             self.maxPlayer = board_str[0] == "W"
-            for i in range(1, len(board_str)):
-                col = ((i - 1) % 8) + 1
-                row = (i - 1) // 8 + 1
-                # For convenience we use W and B in the board instead of X and O:
-                if board_str[i] == "X":
-                    self.board[row][col] = "B"
-                elif board_str[i] == "O":
-                    self.board[row][col] = "W"
+            # Square i is character i + 1, so reverse the squares to put square 0 in the lowest bit
+            cells = board_str[64:0:-1]
+            self.white_bitboard = int(cells.translate(_WHITE_DIGITS), 2)
+            self.black_bitboard = int(cells.translate(_BLACK_DIGITS), 2)
+        self.zobrist = self.__compute_zobrist()
 
     def initialize(self):
         """
         Initializes the position by placing four coins in the middle of the board.
         """
-        mid = self.BOARD_SIZE // 2
-        self.board[mid][mid] = "W"
-        self.board[mid + 1][mid + 1] = "W"
-        self.board[mid][mid + 1] = "B"
-        self.board[mid + 1][mid] = "B"
+        # (4,4) and (5,5) are white, (4,5) and (5,4) are black
+        self.white_bitboard = (1 << 27) | (1 << 36)
+        self.black_bitboard = (1 << 28) | (1 << 35)
         self.maxPlayer = True
+        self.zobrist = self.__compute_zobrist()
 
     def make_move(self, action: OthelloAction):
         """
@@ -76,171 +94,140 @@ class OthelloPosition(object):
         Returns:
             The OthelloPosition resulting from making the move action in the current position.
         """
-        new_pos = self.clone()
-        # if the move is a pass move, we just change the player to move next
         if action.is_pass_move:
-            new_pos.maxPlayer = not new_pos.maxPlayer
-            return new_pos
+            return self.make_move_square(PASS_MOVE)
+        return self.make_move_square((action.row - 1) * 8 + (action.col - 1))
 
-        is_legal_move = new_pos.__is_move(action.row, action.col)
-        if not is_legal_move:
-            raise ValueError("IllegalMoveException")
-
-        current_player = "W" if new_pos.maxPlayer else "B"
-
-        for dr, dc in self.DIRS:
-            capture = new_pos.__captures_in_direction(action.row, action.col, dr, dc)
-
-            if capture:
-                i = 1
-                while new_pos.__is_opp_coin(action.row + dr * i, action.col + dc * i):
-                    new_pos.board[action.row + dr * i, action.col + dc * i] = (
-                        current_player
-                    )
-
-                    i = i + 1
-
-        new_pos.board[action.row, action.col] = current_player
-        new_pos.maxPlayer = not new_pos.maxPlayer
-
-        return new_pos
-
-    def get_moves(self) -> list[OthelloAction]:
+    def make_move_square(self, square: int):
         """
-        Get all possible moves for the current position
+        Same as make_move, but for a move given as a square index instead of an OthelloAction.
+
+        Args:
+            square (int): Square index (row - 1) * 8 + (col - 1), or PASS_MOVE
 
         Returns:
-            A list of OthelloAction representing all possible moves in the position. If the list is empty, there are no legal moves for the player who has the move.
+            The OthelloPosition resulting from making the move in the current position.
         """
-        moves = []
-        append = moves.append
-        for r in range(1, self.BOARD_SIZE + 1):
-            for c in range(1, self.BOARD_SIZE + 1):
-                if self.__is_candidate(r, c) and self.__is_move(r, c):
-                    append(OthelloAction(r, c))
-        return moves
+        new_pos = self.clone()
+        new_pos.make_move_inplace(square)
+        return new_pos
 
-    # ------------ Private methods (helpers) ------------
-    def __captures_in_direction(self, row: int, col: int, dr: int, dc: int) -> bool:
+    def make_move_inplace(self, square: int) -> tuple:
         """
-        Does placing at (row, col) capture at least one opponent disc in (dr, dc)?
-        Must see at least one opponent coin immediately, followed by own coin before hitting empty/out.
+        Make a move on this position itself instead of on a copy. This is what the search uses:
+        it makes a move, searches the subtree and takes the move back with undo_move, so the
+        whole search runs on a single position.
 
         Args:
-            row (int): The row of the board position
-            col (int): The column of the board position
-            dr (int): Delta row
-            dc (int): Delta column
+            square (int): Square index (row - 1) * 8 + (col - 1), or PASS_MOVE
 
         Returns:
-            True if it flips at least one opponent disc in the direction (dr,dc)
+            tuple: The undo information to pass to undo_move
         """
-        size = self.BOARD_SIZE
-        r = row + dr
-        c = col + dc
-        # First neighbor must be opponent
-        if not self.__is_opp_coin(r, c):
-            return False
-        # Then at least one opp followed by an own
-        r += dr
-        c += dc
-        # Walk until we find own or empty/border (no capture)
-        while 1 <= r <= size and 1 <= c <= size:
-            if self.board[r, c] == "E":
-                return False
-            if self.__is_own_coin(r, c):
-                return True
-            r += dr
-            c += dc
-        return False
-
-    def __is_candidate(self, row: int, col: int) -> bool:
+        undo = (self.white_bitboard, self.black_bitboard, self.maxPlayer, self.zobrist, self.flipped_count)
+        # if the move is a pass move, we just change the player to move next
+        if square == PASS_MOVE:
+            self.maxPlayer = not self.maxPlayer
+            self.zobrist ^= ZOBRIST_SIDE
+            self.flipped_count = 0
+            return undo
+
+        if self.maxPlayer:
+            own, opp, own_keys = self.white_bitboard, self.black_bitboard, ZOBRIST_WHITE
+        else:
+            own, opp, own_keys = self.black_bitboard, self.white_bitboard, ZOBRIST_BLACK
+
+        flipped = flips(own, opp, square)
+        move = BIT[square]
+        if not flipped or (own | opp) & move:
+            raise ValueError("IllegalMoveException")
+
+        own |= flipped | move
+        opp ^= flipped
+        if self.maxPlayer:
+            self.white_bitboard, self.black_bitboard = own, opp
+        else:
+            self.white_bitboard, self.black_bitboard = opp, own
+
+        zobrist = self.zobrist ^ ZOBRIST_SIDE ^ own_keys[square]
+        flipped_squares = squares(flipped)
+        for sq in flipped_squares:
+            zobrist ^= ZOBRIST_FLIP[sq]
+        self.zobrist = zobrist
+        self.flipped_count = len(flipped_squares)
+        self.maxPlayer = not self.maxPlayer
+        return undo
+
+    def undo_move(self, undo: tuple):
         """
-        Check if a position is a candidate for a move (empty and has a neighbour)
+        Take back a move made with make_move_inplace.
 
         Args:
-            row (int): The row of the board position
-            col (int): The column of the board position
+            undo (tuple): The value make_move_inplace returned for the move
+        """
+        self.white_bitboard, self.black_bitboard, self.maxPlayer, self.zobrist, self.flipped_count = undo
 
-        Returns:
-             True if it is a candidate
+    def get_moves(self) -> list[OthelloAction]:
         """
-        return self.board[row][col] == "E" and self.__has_neighbour(row, col)
+        Get all possible moves for the current position
 
-    def __is_move(self, row: int, col: int) -> bool:
+        Returns:
+            A list of OthelloAction representing all possible moves in the position. If the list is empty, there are no legal moves for the player who has the move.
         """
-        Check if it is possible to do a move from this position (can capture in at least one direction).
+        return [OthelloAction(sq // 8 + 1, sq % 8 + 1) for sq in self.get_move_squares()]
 
-        Args:
-            row (int): The row of the board position
-            col (int): The column of the board position
+    def get_move_squares(self) -> list[int]:
+        """
+        Get all possible moves for the current position as square indices
 
         Returns:
-             True if it is possible to do a move
+            A list of square indices (row - 1) * 8 + (col - 1), one per legal move. If the list is empty, there are no legal moves for the player who has the move.
         """
-        if row < 1 or row > self.BOARD_SIZE or col < 1 or col > self.BOARD_SIZE:
-            return False
-        # Try all 8 directions. Return as soon as one captures
-        for dr, dc in self.DIRS:
-            if self.__captures_in_direction(row, col, dr, dc):
-                return True
-        return False
-
-    def __is_opp_coin(self, row: int, col: int) -> bool:
-        """
-        Check if the position is occupied by the opponent
+        if self.maxPlayer:
+            return squares(generate_moves(self.white_bitboard, self.black_bitboard))
+        return squares(generate_moves(self.black_bitboard, self.white_bitboard))
 
-        Args:
-            row (int): The row of the board position
-            col (int): The column of the board position
+    # ------------ Private methods (helpers) ------------
+    def __compute_zobrist(self) -> int:
+        """
+        Compute the Zobrist hash of the position from scratch. make_move keeps it up to date
+        incrementally afterwards, so this is only needed when a board is set up directly.
 
         Returns:
-            True if opponent coin
+            The 64-bit hash of the board and the player to move
         """
-        if self.maxPlayer and self.board[row][col] == "B":
-            return True
-        if not self.maxPlayer and self.board[row][col] == "W":
-            return True
-        return False
+        h = 0 if self.maxPlayer else ZOBRIST_SIDE
+        for sq in squares(self.white_bitboard):
+            h ^= ZOBRIST_WHITE[sq]
+        for sq in squares(self.black_bitboard):
+            h ^= ZOBRIST_BLACK[sq]
+        return h
 
-    def __is_own_coin(self, row: int, col: int) -> bool:
+    # ------------ Utility / Introspection ------------
+    @property
+    def board(self) -> np.ndarray:
         """
-        Check if the position is occupied by the player
-
-        Args:
-            row (int): The row of the board position
-            col (int): The column of the board position
+        The position as a padded 10x10 char array ('W', 'B' or 'E'), built from the bitboards.
+        This is a fresh copy: changing it does not change the position.
 
         Returns:
-            True if own coin
+            np.ndarray: The board, board[row][col] for row and col in 1..8
         """
-        if not self.maxPlayer and self.board[row][col] == "B":
-            return True
-        if self.maxPlayer and self.board[row][col] == "W":
-            return True
-        return False
+        board = np.full((self.BOARD_SIZE + 2, self.BOARD_SIZE + 2), "E", dtype="U1")
+        playable = board[1:-1, 1:-1]
+        playable[to_mask(self.white_bitboard)] = "W"
+        playable[to_mask(self.black_bitboard)] = "B"
+        return board
 
-    def __has_neighbour(self, row: int, col: int) -> bool:
+    def count_empty(self) -> int:
         """
-        Check if the position has any non-empty squares
-
-        Args:
-            row (int): The row of the board position
-            col (int): The column of the board position
+        Count the empty squares of the board
 
         Returns:
-            True if it has neighbours
+            The number of empty squares
         """
-        if self.board[row, col] != "E":
-            return False
-        b = self.board
-        # Check the 8 surrounding squares
-        for dr, dc in self.DIRS:
-            if b[row + dr, col + dc] != "E":
-                return True
-        return False
+        return popcount(~(self.white_bitboard | self.black_bitboard) & FULL)
 
-    # ------------ Utility / Introspection ------------
     def to_move(self):
         """
         Check which player's turn it is
@@ -259,15 +246,14 @@ class OthelloPosition(object):
         """
         # Create an uninitialized instance of the same class
         ot = type(self).__new__(type(self))
-        # ot = MyOthelloPosition("")
 
-        # Copy the simple fields
+        # Copy the simple fields (the bitboards are immutable ints, so this is a deep copy)
         ot.BOARD_SIZE = self.BOARD_SIZE
         ot.maxPlayer = self.maxPlayer
-        ot.DIRS = self.DIRS
-
-        # Deep copy the board
-        ot.board = self.board.copy()
+        ot.flipped_count = self.flipped_count
+        ot.zobrist = self.zobrist
+        ot.white_bitboard = self.white_bitboard
+        ot.black_bitboard = self.black_bitboard
 
         return ot
 
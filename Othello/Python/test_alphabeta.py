@@ -0,0 +1,80 @@
+import unittest
+
+from AlphaBeta import AlphaBeta
+from Bitboard import flips, popcount
+from CountingEvaluator import CountingEvaluator
+from HeuristicEvaluator import HeuristicEvaluator
+from OthelloPosition import OthelloPosition, PASS_MOVE
+
+# The default position of Othello.main, black to move
+POSITION = "BEXEXOOOXEEXXOEXEEEEOOXOEEEOOOEEEEOOOOEEEEEXOEEEEEEEEEEEEEEEEEEEE"
+
+
+class CountingSearchTest(unittest.TestCase):
+    """
+    A depth-1 search with the counting evaluator must play the move that flips the most discs.
+    """
+
+    def assert_greedy(self, pos: OthelloPosition):
+        if pos.maxPlayer:
+            own, opp = pos.white_bitboard, pos.black_bitboard
+        else:
+            own, opp = pos.black_bitboard, pos.white_bitboard
+        flipped = {square: popcount(flips(own, opp, square)) for square in pos.get_move_squares()}
+        self.assertGreater(len(set(flipped.values())), 1)
+
+        algorithm = AlphaBeta(CountingEvaluator(pos.maxPlayer), depth=1, quiescence_depth=0)
+        move = algorithm.evaluate(pos)
+
+        square = (move.row - 1) * 8 + (move.col - 1)
+        self.assertEqual(flipped[square], max(flipped.values()))
+        # The score is the disc differential of the starting player after the move
+        self.assertEqual(move.value, popcount(own) - popcount(opp) + 2 * flipped[square] + 1)
+
+    def test_black_to_move(self):
+        self.assert_greedy(OthelloPosition(POSITION))
+
+    def test_white_to_move(self):
+        pos = OthelloPosition(POSITION)
+        pos = pos.make_move_square(pos.get_move_squares()[0])
+        self.assert_greedy(pos)
+
+
+class GameOverTest(unittest.TestCase):
+    """
+    A finished game is scored exactly by its disc margin, not by the heuristic.
+    """
+
+    def test_last_move_fills_the_board(self):
+        # (8,8) is the only empty square; after it white leads by 14 discs
+        pos = OthelloPosition("WOOOOOOOOXOXXXXOOXXOOOOOOXOXOOXOXXOXOOOOXXXOOOOOXXXXXXXXXXXXXXOXE")
+        move = AlphaBeta(HeuristicEvaluator(True), depth=3).evaluate(pos)
+        self.assertEqual((move.row, move.col), (8, 8))
+        self.assertEqual(move.value, 14 * AlphaBeta.GameOverDiscValue)
+
+    def test_neither_side_can_move(self):
+        # Only white discs are left, so nobody can move although four squares are empty
+        pos = OthelloPosition("W" + "EEEE" + "O" * 60)
+        move = AlphaBeta(HeuristicEvaluator(True), depth=4).evaluate(pos)
+        self.assertTrue(move.is_pass_move)
+        self.assertEqual(move.value, 60 * AlphaBeta.GameOverDiscValue)
+
+
+class MovePriorityTest(unittest.TestCase):
+    """
+    The search orders moves by the evaluator's move_priority, including overrides of it.
+    """
+
+    def test_override_is_used(self):
+        class ReversedPriority(CountingEvaluator):
+            def move_priority(self, action):
+                return -super().move_priority(action)
+
+        algorithm = AlphaBeta(ReversedPriority(True))
+        corner, x_square = 0, 9
+        self.assertLess(algorithm.square_priority[corner], algorithm.square_priority[x_square])
+        self.assertEqual(algorithm.square_priority[PASS_MOVE], float("inf"))
+
+
+if __name__ == "__main__":
+    unittest.main()